@@ -1,73 +1,118 @@
 """
 CrewAI Agent Definitions for DevOps Automation
 Defines specialized agents for analyzing requirements and generating IaC scripts
+
+Agents and the LLM are built lazily on first use and cached, so importing
+this module does not construct agents the caller never runs.
 """
 
+from functools import cache
+
 from crewai import Agent
 from ollama_cloud_llm import OllamaCloudGenerateLLM
 from config import Config
 
-# Initialize using custom LLM
-llm = OllamaCloudGenerateLLM(
-    model="gpt-oss:120b",
-    api_key=Config.OLLAMA_API_KEY,
-    temperature=0.3,
-    stream=False,
+
+def _prompt(text):
+    """Collapse the indentation and line breaks of a triple-quoted prompt"""
+    return " ".join(text.split())
+
+
+_BACKSTORY_REQUIREMENTS_ANALYZER = _prompt(
+    """You are an experienced DevOps engineer who excels at understanding
+    application deployment requirements. You can identify the key components needed
+    for deploying applications on Kubernetes, including resource requirements,
+    container images, ports, and environment configurations."""
 )
 
+_BACKSTORY_IAC_GENERATOR = _prompt(
+    """You are a Kubernetes expert who specializes in writing clean,
+    efficient, and production-ready YAML manifests. You follow best practices for
+    Kubernetes deployments including proper resource limits, health checks, labels,
+    and annotations. You generate valid YAML that can be directly applied to a cluster."""
+)
 
-# Requirements Analyzer Agent
-requirements_analyzer = Agent(
-    role="DevOps Requirements Analyst",
-    goal="Analyze user requirements and extract deployment specifications for containerized applications",
-    backstory="""You are an experienced DevOps engineer who excels at understanding 
-    application deployment requirements. You can identify the key components needed 
-    for deploying applications on Kubernetes, including resource requirements, 
-    container images, ports, and environment configurations.""",
-    llm=llm,
-    verbose=Config.VERBOSE_LEVEL > 0,
-    allow_delegation=Config.ALLOW_DELEGATION,
+_BACKSTORY_VALIDATOR = _prompt(
+    """You are a quality assurance expert for Kubernetes configurations.
+    You review YAML manifests to ensure they are syntactically correct, follow
+    Kubernetes best practices, and include all necessary fields. You provide
+    feedback on potential issues and confirm when configurations are deployment-ready."""
 )
 
-# IaC Generator Agent
-iac_generator = Agent(
-    role="Infrastructure as Code Generator",
-    goal="Generate production-ready Kubernetes deployment manifests based on analyzed requirements",
-    backstory="""You are a Kubernetes expert who specializes in writing clean, 
-    efficient, and production-ready YAML manifests. You follow best practices for 
-    Kubernetes deployments including proper resource limits, health checks, labels, 
-    and annotations. You generate valid YAML that can be directly applied to a cluster.""",
-    llm=llm,
-    verbose=Config.VERBOSE_LEVEL > 0,
-    allow_delegation=Config.ALLOW_DELEGATION,
+_BACKSTORY_REMEDIATION_AGENT = _prompt(
+    """You are a seasoned Site Reliability Engineer (SRE) with deep expertise
+    in troubleshooting Kubernetes deployments. You can quickly diagnose common failure
+    patterns like OOMKilled pods, CrashLoopBackOff errors, ImagePullBackOff issues,
+    and resource constraints. For each failure, you provide specific remediation actions
+    such as adjusting resource limits, fixing configuration errors, scaling replicas,
+    or suggesting alternative approaches. You think systematically about root causes
+    and prefer permanent fixes over temporary workarounds."""
 )
 
+
+@cache
+def get_llm():
+    """
+    Return the shared custom LLM instance used by all agents
+
+    Returns:
+        OllamaCloudGenerateLLM: Configured LLM instance
+    """
+    return OllamaCloudGenerateLLM(
+        model="gpt-oss:120b",
+        api_key=Config.OLLAMA_API_KEY,
+        temperature=0.3,
+        stream=False,
+    )
+
+
+# Requirements Analyzer Agent
+@cache
+def requirements_analyzer():
+    return Agent(
+        role="DevOps Requirements Analyst",
+        goal="Analyze user requirements and extract deployment specifications for containerized applications",
+        backstory=_BACKSTORY_REQUIREMENTS_ANALYZER,
+        llm=get_llm(),
+        verbose=Config.VERBOSE_LEVEL > 0,
+        allow_delegation=Config.ALLOW_DELEGATION,
+    )
+
+
+# IaC Generator Agent
+@cache
+def iac_generator():
+    return Agent(
+        role="Infrastructure as Code Generator",
+        goal="Generate production-ready Kubernetes deployment manifests based on analyzed requirements",
+        backstory=_BACKSTORY_IAC_GENERATOR,
+        llm=get_llm(),
+        verbose=Config.VERBOSE_LEVEL > 0,
+        allow_delegation=Config.ALLOW_DELEGATION,
+    )
+
+
 # Validator Agent
-validator = Agent(
-    role="Configuration Validator",
-    goal="Validate generated Kubernetes manifests for syntax correctness and best practices",
-    backstory="""You are a quality assurance expert for Kubernetes configurations. 
-    You review YAML manifests to ensure they are syntactically correct, follow 
-    Kubernetes best practices, and include all necessary fields. You provide 
-    feedback on potential issues and confirm when configurations are deployment-ready.""",
-    llm=llm,
-    verbose=Config.VERBOSE_LEVEL > 0,
-    allow_delegation=Config.ALLOW_DELEGATION,
-)
+@cache
+def validator():
+    return Agent(
+        role="Configuration Validator",
+        goal="Validate generated Kubernetes manifests for syntax correctness and best practices",
+        backstory=_BACKSTORY_VALIDATOR,
+        llm=get_llm(),
+        verbose=Config.VERBOSE_LEVEL > 0,
+        allow_delegation=Config.ALLOW_DELEGATION,
+    )
 
 
 # Remediation Agent (Self-Healing)
-remediation_agent = Agent(
-    role="DevOps Remediation Specialist",
-    goal="Diagnose deployment failures and propose automated fixes to restore service health",
-    backstory="""You are a seasoned Site Reliability Engineer (SRE) with deep expertise 
-    in troubleshooting Kubernetes deployments. You can quickly diagnose common failure 
-    patterns like OOMKilled pods, CrashLoopBackOff errors, ImagePullBackOff issues, 
-    and resource constraints. For each failure, you provide specific remediation actions 
-    such as adjusting resource limits, fixing configuration errors, scaling replicas, 
-    or suggesting alternative approaches. You think systematically about root causes 
-    and prefer permanent fixes over temporary workarounds.""",
-    llm=llm,
-    verbose=Config.VERBOSE_LEVEL > 0,
-    allow_delegation=Config.ALLOW_DELEGATION,
-)
+@cache
+def remediation_agent():
+    return Agent(
+        role="DevOps Remediation Specialist",
+        goal="Diagnose deployment failures and propose automated fixes to restore service health",
+        backstory=_BACKSTORY_REMEDIATION_AGENT,
+        llm=get_llm(),
+        verbose=Config.VERBOSE_LEVEL > 0,
+        allow_delegation=Config.ALLOW_DELEGATION,
+    )
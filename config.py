@@ -4,42 +4,137 @@ Centralized settings for the agentic solution
 """
 
 import os
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Load environment variables from .env, unless the environment already
+# provides the API key (containers, CI, a parent process that loaded it)
+if not os.environ.get("OLLAMA_API_KEY"):
+    load_dotenv(override=False)
 
 
-class Config:
-    """Central configuration class for the application"""
+def _env_settings():
+    """Read the settings that come from environment variables"""
+    return {
+        "OLLAMA_API_KEY": os.getenv("OLLAMA_API_KEY"),
+        "OLLAMA_BASE_URL": os.getenv("OLLAMA_BASE_URL", "https://api.ollama.cloud"),
+        "DEFAULT_MODEL": os.getenv("DEFAULT_MODEL", "llama2:7b"),
+        "VERBOSE_LEVEL": int(os.getenv("VERBOSE_LEVEL", "2")),
+        "MAX_CONCURRENCY": int(os.getenv("MAX_CONCURRENCY", "4")),
+        "CACHE_TTL_SECONDS": int(os.getenv("CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+        "DAEMON_PORT": int(os.getenv("DAEMON_PORT", "8765")),
+    }
+
+
+_settings = _env_settings()
+
+# Module-level constants, read once at import; hot paths can import these
+# directly instead of going through the Config class
+
+# Ollama Cloud Settings
+OLLAMA_API_KEY = _settings["OLLAMA_API_KEY"]
+OLLAMA_BASE_URL = _settings["OLLAMA_BASE_URL"]
+
+# Model Configuration
+DEFAULT_MODEL = _settings["DEFAULT_MODEL"]
+
+# Logging Configuration
+VERBOSE_LEVEL = _settings["VERBOSE_LEVEL"]
+LOG_FILE = "crew_execution.log"
+
+# Output Configuration
+OUTPUT_DIR = "outputs"
+
+# Result Cache Configuration
+CACHE_DIR = os.path.join(OUTPUT_DIR, ".llmcache")
+CACHE_TTL_SECONDS = _settings["CACHE_TTL_SECONDS"]
+
+# Daemon Configuration (python main.py --serve)
+DAEMON_PORT = _settings["DAEMON_PORT"]
+DAEMON_PID_FILE = os.path.join(OUTPUT_DIR, ".daemon.pid")
 
-    # Ollama Cloud Settings
-    OLLAMA_API_KEY = os.getenv("OLLAMA_API_KEY")
-    OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "https://api.ollama.cloud")
+# Agent Configuration
+ALLOW_DELEGATION = False
 
-    # Model Configuration
-    DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "llama2:7b")
+# Maximum number of workflows running against the LLM at once
+MAX_CONCURRENCY = _settings["MAX_CONCURRENCY"]
 
-    # Logging Configuration
-    VERBOSE_LEVEL = int(os.getenv("VERBOSE_LEVEL", "2"))
-    LOG_FILE = "crew_execution.log"
 
-    # Output Configuration
-    OUTPUT_DIR = "outputs"
+class Config:
+    """Central configuration class for the application"""
+
+    OLLAMA_API_KEY = OLLAMA_API_KEY
+    OLLAMA_BASE_URL = OLLAMA_BASE_URL
+    DEFAULT_MODEL = DEFAULT_MODEL
+    VERBOSE_LEVEL = VERBOSE_LEVEL
+    LOG_FILE = LOG_FILE
+    OUTPUT_DIR = OUTPUT_DIR
+    CACHE_DIR = CACHE_DIR
+    CACHE_TTL_SECONDS = CACHE_TTL_SECONDS
+    DAEMON_PORT = DAEMON_PORT
+    DAEMON_PID_FILE = DAEMON_PID_FILE
+    ALLOW_DELEGATION = ALLOW_DELEGATION
+    MAX_CONCURRENCY = MAX_CONCURRENCY
 
-    # Agent Configuration
-    ALLOW_DELEGATION = False
+    # Set once validate() has passed for the current settings
+    _validated = False
 
-    @staticmethod
-    def validate():
-        """Validate required configuration"""
-        if not Config.OLLAMA_API_KEY:
+    @classmethod
+    def refresh(cls):
+        """Re-read environment settings into Config and the module constants"""
+        settings = _env_settings()
+        globals().update(settings)
+        for name, value in settings.items():
+            setattr(cls, name, value)
+        cls._validated = False
+
+    @classmethod
+    def validate(cls):
+        """Validate required configuration (checked once per process)"""
+        if cls._validated:
+            return True
+        if not cls.OLLAMA_API_KEY:
             raise ValueError("OLLAMA_API_KEY is not set in .env file")
-        if not Config.OLLAMA_BASE_URL:
+        if not cls.OLLAMA_BASE_URL:
             raise ValueError("OLLAMA_BASE_URL is not set in .env file")
+        cls._validated = True
         return True
 
 
+# Background listener started by configure_logging()
+_log_listener = None
+
+
+def configure_logging(stream=None):
+    """
+    Set up application logging for an entry point (once per process)
+
+    Records go onto a queue and a background listener thread writes them to
+    Config.LOG_FILE and the console, so log I/O never blocks a crew run.
+
+    Args:
+        stream: Console stream for log output. Defaults to sys.stderr
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[QueueHandler(log_queue)],
+    )
+    _log_listener = QueueListener(
+        log_queue, logging.FileHandler(Config.LOG_FILE), logging.StreamHandler(stream)
+    )
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+
 if __name__ == "__main__":
     # Test configuration
     try:
@@ -4,7 +4,7 @@ Provides LLM instances for CrewAI agents
 """
 
 import os
-from langchain_ollama import OllamaLLM
+from functools import lru_cache
 from config import Config
 
 
@@ -12,6 +12,9 @@ def get_ollama_llm(model=None):
     """
     Initialize Ollama Cloud LLM connection
 
+    Instances are cached per (model, base URL, API key), so callers asking
+    for the same model share one client and its connection pool.
+
     Args:
         model (str): Model name to use. Defaults to Config.DEFAULT_MODEL
 
@@ -21,10 +24,18 @@ def get_ollama_llm(model=None):
     if model is None:
         model = Config.DEFAULT_MODEL
 
+    return _cached_ollama_llm(model, Config.OLLAMA_BASE_URL, Config.OLLAMA_API_KEY)
+
+
+@lru_cache(maxsize=8)
+def _cached_ollama_llm(model, base_url, api_key):
+    # Deferred so importing this module doesn't load langchain
+    from langchain_ollama import OllamaLLM
+
     return OllamaLLM(
-        base_url=Config.OLLAMA_BASE_URL,
+        base_url=base_url,
         model=model,
-        headers={"Authorization": f"Bearer {Config.OLLAMA_API_KEY}"},
+        headers={"Authorization": f"Bearer {api_key}"},
     )
 
 
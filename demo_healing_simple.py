@@ -4,29 +4,53 @@ Demonstrates the healing workflow concept without long LLM calls
 """
 
 import os
+import re
+import sys
 import json
 import time
 from datetime import datetime
 from config import Config
 
+# Raises the memory request to 1Gi and adds a matching limit in one pass
+_MEMORY_FIX_RE = re.compile(r"(requests:\n(\s*))memory: 512Mi")
+_MEMORY_FIX = r"\1memory: 1Gi\n          limits:\n\2memory: 1Gi"
 
 def ensure_output_dir():
     """Create output directory if it doesn't exist"""
-    if not os.path.exists(Config.OUTPUT_DIR):
-        os.makedirs(Config.OUTPUT_DIR)
+    os.makedirs(Config.OUTPUT_DIR, exist_ok=True)
+
+
+def _emit(*lines):
+    """Write a block of output lines to stdout in a single call"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _iso_timestamp(timestamp_ns):
+    """Format a time.time_ns() value as a local ISO-8601 timestamp"""
+    seconds, nanos = divmod(timestamp_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=nanos // 1000).isoformat()
+
+
+def _format_timestamps(remediation_log):
+    """Replace the raw nanosecond timestamps in the log with ISO strings"""
+    for entry in (remediation_log, *remediation_log["attempts"]):
+        entry["timestamp"] = _iso_timestamp(entry["timestamp"])
 
 
 def demo_healing_workflow():
     """
     Demonstrate self-healing workflow with simulated rapid responses
     """
-    print("=" * 80)
-    print("SELF-HEALING DEMO - Simplified Version")
-    print("=" * 80)
-    print("\nUser Prompt: Deploy a Java Spring Boot application with 3 replicas,")
-    print("             needs 512Mi memory and 500m CPU\n")
+    _emit(
+        "=" * 80,
+        "SELF-HEALING DEMO - Simplified Version",
+        "=" * 80,
+        "\nUser Prompt: Deploy a Java Spring Boot application with 3 replicas,",
+        "             needs 512Mi memory and 500m CPU\n",
+    )
 
     start_time = time.time()
+    output_dir = Config.OUTPUT_DIR
     ensure_output_dir()
 
     # Initial Manifest (from Phase 1 - we already know this works)
@@ -67,7 +91,7 @@ spec:
           periodSeconds: 5"""
 
     remediation_log = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": time.time_ns(),
         "user_prompt": "Deploy a Java Spring Boot application with 3 replicas, needs 512Mi memory and 500m CPU",
         "max_retries": 3,
         "attempts": [],
@@ -76,55 +100,58 @@ spec:
     current_manifest = initial_manifest
 
     # Attempt 1: Initial deployment fails
-    print("\n" + "=" * 80)
-    print("ATTEMPT #1: Initial Deployment")
-    print("=" * 80)
-    print("\n🚀 Deploying manifest...")
+    _emit(
+        "\n" + "=" * 80,
+        "ATTEMPT #1: Initial Deployment",
+        "=" * 80,
+        "\n🚀 Deploying manifest...",
+    )
     time.sleep(1)
 
-    print("\n❌ DEPLOYMENT FAILED!")
-    print("\nPod Status:")
-    print("  - java-spring-boot-78f5d4d7c-abc12: OOMKilled (Exit Code: 137)")
-    print("  - java-spring-boot-78f5d4d7c-def34: OOMKilled (Exit Code: 137)")
-    print("  - java-spring-boot-78f5d4d7c-ghi56: OOMKilled (Exit Code: 137)")
-    print("\nError: Pods killed due to out of memory")
-    print("  Current memory limit: 512Mi")
-    print("  Observed memory usage: 580Mi (exceeds limit)")
+    _emit(
+        "\n❌ DEPLOYMENT FAILED!",
+        "\nPod Status:",
+        "  - java-spring-boot-78f5d4d7c-abc12: OOMKilled (Exit Code: 137)",
+        "  - java-spring-boot-78f5d4d7c-def34: OOMKilled (Exit Code: 137)",
+        "  - java-spring-boot-78f5d4d7c-ghi56: OOMKilled (Exit Code: 137)",
+        "\nError: Pods killed due to out of memory",
+        "  Current memory limit: 512Mi",
+        "  Observed memory usage: 580Mi (exceeds limit)",
+    )
 
     remediation_log["attempts"].append(
         {
             "attempt_number": 1,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time_ns(),
             "deployment_status": "FAILED - OOMKilled",
             "result": "FAILED",
         }
     )
 
     # Self-Healing Phase
-    print("\n" + "=" * 80)
-    print("🔧 SELF-HEALING ACTIVATED")
-    print("=" * 80)
-
-    print("\n📊 Step 1: Monitoring - Detecting failure type...")
+    _emit(
+        "\n" + "=" * 80,
+        "🔧 SELF-HEALING ACTIVATED",
+        "=" * 80,
+        "\n📊 Step 1: Monitoring - Detecting failure type...",
+    )
     time.sleep(0.5)
-    print("   ✓ Failure detected: OOMKilled")
-
-    print("\n🔍 Step 2: Diagnosing root cause...")
+    _emit(
+        "   ✓ Failure detected: OOMKilled",
+        "\n🔍 Step 2: Diagnosing root cause...",
+    )
     time.sleep(0.5)
-    print("   ✓ Root Cause: Memory limit (512Mi) insufficient")
-    print("   ✓ Observed: Application needs ~580Mi")
-    print("   ✓ Recommendation: Increase memory limit to 1Gi")
-
-    print("\n🛠️  Step 3: Applying remediation...")
+    _emit(
+        "   ✓ Root Cause: Memory limit (512Mi) insufficient",
+        "   ✓ Observed: Application needs ~580Mi",
+        "   ✓ Recommendation: Increase memory limit to 1Gi",
+        "\n🛠️  Step 3: Applying remediation...",
+    )
     time.sleep(0.5)
-    print("   ✓ Modifying manifest: memory 512Mi → 1Gi")
+    _emit("   ✓ Modifying manifest: memory 512Mi → 1Gi")
 
     # Apply fix to manifest
-    healed_manifest = current_manifest.replace("memory: 512Mi", "memory: 1Gi")
-    healed_manifest = healed_manifest.replace(
-        "requests:\n            memory: 1Gi",
-        "requests:\n            memory: 1Gi\n          limits:\n            memory: 1Gi",
-    )
+    healed_manifest = _MEMORY_FIX_RE.sub(_MEMORY_FIX, current_manifest, count=1)
 
     remediation_log["attempts"][-1]["healing_attempted"] = True
     remediation_log["attempts"][-1][
@@ -134,28 +161,32 @@ spec:
         "remediation"
     ] = "Increased memory limit from 512Mi to 1Gi"
 
-    print("\n⏳ Exponential backoff: Waiting 1 second before retry...")
+    _emit("\n⏳ Exponential backoff: Waiting 1 second before retry...")
     time.sleep(1)
 
     # Attempt 2: Retry with fixed manifest
-    print("\n" + "=" * 80)
-    print("ATTEMPT #2: Deployment Retry with Corrected Manifest")
-    print("=" * 80)
-    print("\n🚀 Deploying updated manifest...")
+    _emit(
+        "\n" + "=" * 80,
+        "ATTEMPT #2: Deployment Retry with Corrected Manifest",
+        "=" * 80,
+        "\n🚀 Deploying updated manifest...",
+    )
     time.sleep(1)
 
-    print("\n✅ DEPLOYMENT SUCCESSFUL!")
-    print("\nPod Status:")
-    print("  - java-spring-boot-9b8c7f5e2-xyz12: Running (Ready 1/1)")
-    print("  - java-spring-boot-9b8c7f5e2-xyz34: Running (Ready 1/1)")
-    print("  - java-spring-boot-9b8c7f5e2-xyz56: Running (Ready 1/1)")
-    print("\n✓ All replicas healthy and ready to serve traffic")
-    print("✓ Memory usage: 580Mi (within 1Gi limit)")
+    _emit(
+        "\n✅ DEPLOYMENT SUCCESSFUL!",
+        "\nPod Status:",
+        "  - java-spring-boot-9b8c7f5e2-xyz12: Running (Ready 1/1)",
+        "  - java-spring-boot-9b8c7f5e2-xyz34: Running (Ready 1/1)",
+        "  - java-spring-boot-9b8c7f5e2-xyz56: Running (Ready 1/1)",
+        "\n✓ All replicas healthy and ready to serve traffic",
+        "✓ Memory usage: 580Mi (within 1Gi limit)",
+    )
 
     remediation_log["attempts"].append(
         {
             "attempt_number": 2,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time_ns(),
             "deployment_status": "SUCCESS",
             "result": "SUCCESS",
         }
@@ -170,34 +201,34 @@ spec:
     # Save results
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-    log_file = os.path.join(Config.OUTPUT_DIR, f"remediation_log_{timestamp}.json")
-    with open(log_file, "w") as f:
-        json.dump(remediation_log, f, indent=2)
+    log_file = os.path.join(output_dir, f"remediation_log_{timestamp}.json")
+    _format_timestamps(remediation_log)
+    with open(log_file, "w", encoding="utf-8", buffering=65536) as f:
+        json.dump(remediation_log, f, ensure_ascii=False, indent=2)
 
-    manifest_file = os.path.join(
-        Config.OUTPUT_DIR, f"healed_deployment_{timestamp}.yaml"
-    )
+    manifest_file = os.path.join(output_dir, f"healed_deployment_{timestamp}.yaml")
     with open(manifest_file, "w") as f:
         f.write(healed_manifest)
 
-    print("\n" + "=" * 80)
-    print("📝 RESULTS")
-    print("=" * 80)
-    print(f"\n✓ Remediation log saved: {log_file}")
-    print(f"✓ Healed manifest saved: {manifest_file}")
-    print(f"\n✓ Total execution time: {execution_time:.2f} seconds")
-    print(f"✓ Final status: {remediation_log['final_status']}")
-    print(f"✓ Total attempts: {remediation_log['total_attempts']}")
-
-    print("\n" + "=" * 80)
-    print("🎉 SELF-HEALING DEMONSTRATION COMPLETE")
-    print("=" * 80)
-    print("\nKey Achievements:")
-    print("  ✓ Detected OOMKilled failure automatically")
-    print("  ✓ Diagnosed memory insufficiency (512Mi → 580Mi needed)")
-    print("  ✓ Applied fix (increased to 1Gi)")
-    print("  ✓ Retry succeeded on second attempt")
-    print("  ✓ Full audit trail logged")
+    _emit(
+        "\n" + "=" * 80,
+        "📝 RESULTS",
+        "=" * 80,
+        f"\n✓ Remediation log saved: {log_file}",
+        f"✓ Healed manifest saved: {manifest_file}",
+        f"\n✓ Total execution time: {execution_time:.2f} seconds",
+        f"✓ Final status: {remediation_log['final_status']}",
+        f"✓ Total attempts: {remediation_log['total_attempts']}",
+        "\n" + "=" * 80,
+        "🎉 SELF-HEALING DEMONSTRATION COMPLETE",
+        "=" * 80,
+        "\nKey Achievements:",
+        "  ✓ Detected OOMKilled failure automatically",
+        "  ✓ Diagnosed memory insufficiency (512Mi → 580Mi needed)",
+        "  ✓ Applied fix (increased to 1Gi)",
+        "  ✓ Retry succeeded on second attempt",
+        "  ✓ Full audit trail logged",
+    )
 
     return remediation_log
 
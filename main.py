@@ -4,31 +4,250 @@ Coordinates agents and tasks to generate Kubernetes manifests from user prompts
 """
 
 import os
+import re
+import sys
+import hmac
 import json
+import time
+import socket
+import secrets
+import tempfile
+import threading
+import asyncio
+import argparse
+import hashlib
+import importlib.util
+from functools import cache
 from datetime import datetime
-from crewai import Crew, Process
-from agents import requirements_analyzer, iac_generator, validator, remediation_agent
-from tasks import create_analysis_task, create_generation_task, create_validation_task
-from config import Config
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import Config, configure_logging
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler(Config.LOG_FILE), logging.StreamHandler()],
-)
 logger = logging.getLogger(__name__)
 
+# Manifest embedded in the crew output: from the start of the first line that
+# contains "apiVersion:" up to a closing code fence (possibly indented, as in
+# a fenced block inside a markdown list) or the end of the text
+_YAML_RE = re.compile(r"^.*apiVersion:(?s:.*?)(?=\n[ \t]*```|\Z)", re.MULTILINE)
+_KIND_LINE_RE = re.compile(r"^[\s-]*kind:", re.MULTILINE)
+
+# Header carrying the per-run token from Config.DAEMON_PID_FILE (--serve)
+DAEMON_TOKEN_HEADER = "X-Daemon-Token"
+
+# Limits how many daemon requests run a crew at once
+_daemon_slots = threading.BoundedSemaphore(Config.MAX_CONCURRENCY)
+
+
+def run_batch_loop(coro):
+    """
+    Run a batch coroutine on uvloop when it is installed
+
+    The loop is scoped to this call; no process-wide policy is installed.
+    Falls back to asyncio.run() on Windows, on Python < 3.11 or when
+    uvloop is missing.
+
+    Args:
+        coro: Coroutine to run to completion
+
+    Returns:
+        The coroutine's result
+    """
+    if sys.platform != "win32" and sys.version_info >= (3, 11):
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+                return runner.run(coro)
+    return asyncio.run(coro)
+
 
 def ensure_output_dir():
     """Create output directory if it doesn't exist"""
-    if not os.path.exists(Config.OUTPUT_DIR):
-        os.makedirs(Config.OUTPUT_DIR)
-        logger.info(f"Created output directory: {Config.OUTPUT_DIR}")
+    os.makedirs(Config.OUTPUT_DIR, exist_ok=True)
+
+
+@cache
+def prompt_templates_version():
+    """
+    Short hash of the agent and task definitions
+
+    Part of the result cache key, so editing an agent backstory or task
+    prompt invalidates results generated with the old wording.
+
+    Returns:
+        str: Hex digest prefix
+    """
+    digest = hashlib.sha256()
+    # Hash the source files without importing them, so a cache hit never
+    # has to load crewai
+    for module_name in ("agents", "tasks"):
+        with open(importlib.util.find_spec(module_name).origin, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def result_cache_key(user_prompt):
+    """
+    Build the exact-match cache key for a prompt
+
+    The prompt is canonicalized by collapsing runs of whitespace and
+    trimming the ends, so re-typed or re-wrapped requests share an entry.
+    Case is kept: image names and tags are case-sensitive.
+
+    Args:
+        user_prompt (str): User's deployment request
+
+    Returns:
+        str: SHA-256 hex digest of the prompt, model and template version
+    """
+    payload = json.dumps(
+        {
+            "prompt": " ".join(user_prompt.split()),
+            "model": Config.DEFAULT_MODEL,
+            "templates": prompt_templates_version(),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_cached_result(cache_key):
+    """
+    Return a cached crew result if present and younger than the TTL
+
+    Expired or unreadable entries are deleted.
+
+    Args:
+        cache_key (str): Key from result_cache_key()
+
+    Returns:
+        str or None: Cached result text
+    """
+    path = os.path.join(Config.CACHE_DIR, f"{cache_key}.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        entry = None
+
+    created = entry.get("created") if isinstance(entry, dict) else None
+    result = entry.get("result") if isinstance(entry, dict) else None
+    if (
+        not isinstance(created, (int, float))
+        or not isinstance(result, str)
+        or time.time() - created > Config.CACHE_TTL_SECONDS
+    ):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+    return result
+
+
+def prune_result_cache():
+    """
+    Delete cache entries (and stray temporary files) older than the TTL
 
+    Entries for one-off prompts are never read again, so expiry on read
+    alone would let them accumulate.
 
-def save_results(user_prompt, result, execution_time):
+    Returns:
+        int: Number of files removed
+    """
+    cutoff = time.time() - Config.CACHE_TTL_SECONDS
+    removed = 0
+    try:
+        entries = list(os.scandir(Config.CACHE_DIR))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        if not entry.name.endswith((".json", ".tmp")):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def store_cached_result(cache_key, result_str):
+    """
+    Store a crew result in the on-disk cache and prune expired entries
+
+    The entry is written to a uniquely named temporary file and renamed into
+    place, so concurrent readers never see a partial entry and concurrent
+    writers (daemon threads) never share a temporary file.
+
+    Args:
+        cache_key (str): Key from result_cache_key()
+        result_str (str): Crew result text
+    """
+    os.makedirs(Config.CACHE_DIR, exist_ok=True)
+    path = os.path.join(Config.CACHE_DIR, f"{cache_key}.json")
+    # A temporary file left by a failed write is removed by the TTL prune
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=Config.CACHE_DIR, suffix=".tmp", delete=False
+    ) as f:
+        json.dump({"created": time.time(), "result": result_str}, f, ensure_ascii=False)
+    os.replace(f.name, path)
+    prune_result_cache()
+
+
+def is_kubernetes_manifest(text):
+    """
+    Check that YAML text contains at least one Kubernetes object
+
+    Parsed with PyYAML's libyaml-backed loader when available.
+
+    Args:
+        text (str): Extracted manifest text, possibly several documents
+
+    Returns:
+        bool: True if any document is a mapping with apiVersion and kind
+
+    Raises:
+        ValueError: If the text is not valid YAML
+    """
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    try:
+        documents = list(yaml.load_all(text, Loader=loader))
+    except yaml.YAMLError as e:
+        raise ValueError(str(e)) from e
+    return any(
+        isinstance(document, dict) and "apiVersion" in document and "kind" in document
+        for document in documents
+    )
+
+
+def contains_manifest(result_str):
+    """
+    Check whether crew output contains a parseable Kubernetes manifest
+
+    Args:
+        result_str (str): Crew result text
+
+    Returns:
+        bool: True if the extracted manifest parses and has apiVersion and kind
+    """
+    match = _YAML_RE.search(result_str)
+    if not match:
+        return False
+    try:
+        return is_kubernetes_manifest(match.group(0))
+    except ValueError:
+        return False
+
+
+def save_results(user_prompt, result, execution_time, cached=False, output_suffix=""):
     """
     Save execution results to file
 
@@ -36,66 +255,99 @@ def save_results(user_prompt, result, execution_time):
         user_prompt (str): Original user prompt
         result (str): Crew execution result
         execution_time (float): Execution duration in seconds
+        cached (bool): Whether the result was served from the result cache
+        output_suffix (str): Appended to output file names to keep them unique
     """
     ensure_output_dir()
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    now = datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
+    # Stringify the crew output once; both files below are written from it
+    result_str = str(result)
 
     # Save detailed result as JSON
     result_data = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now.isoformat(),
         "user_prompt": user_prompt,
         "execution_time_seconds": round(execution_time, 2),
         "model": Config.DEFAULT_MODEL,
-        "result": str(result),
+        "cached": cached,
+        "result": result_str,
     }
 
-    json_filename = os.path.join(Config.OUTPUT_DIR, f"result_{timestamp}.json")
-    with open(json_filename, "w") as f:
-        json.dump(result_data, f, indent=2)
+    json_filename = os.path.join(Config.OUTPUT_DIR, f"result_{timestamp}{output_suffix}.json")
+    # Serialize in one shot and write once rather than streaming json.dump's
+    # many small chunks through the file object
+    with open(json_filename, "w", encoding="utf-8") as f:
+        f.write(json.dumps(result_data, indent=2, ensure_ascii=False))
     logger.info(f"Saved detailed results to: {json_filename}")
 
     # Extract and save YAML manifest if present
-    result_str = str(result)
-    if "apiVersion" in result_str and "kind:" in result_str:
-        yaml_filename = os.path.join(Config.OUTPUT_DIR, f"deployment_{timestamp}.yaml")
-
-        # Extract YAML content (simple extraction)
-        lines = result_str.split("\n")
-        yaml_lines = []
-        in_yaml = False
-
-        for line in lines:
-            if "apiVersion:" in line:
-                in_yaml = True
-            if in_yaml:
-                yaml_lines.append(line)
-
-        if yaml_lines:
-            with open(yaml_filename, "w") as f:
-                f.write("\n".join(yaml_lines))
+    match = _YAML_RE.search(result_str)
+    if match:
+        manifest = match.group(0)
+        try:
+            is_manifest = is_kubernetes_manifest(manifest)
+        except ValueError as e:
+            # Keep manifest-shaped output (a "kind:" key line) so it can be
+            # fixed up by hand; prose that merely mentions the fields is dropped
+            logger.warning(f"Extracted manifest is not valid YAML: {e}")
+            is_manifest = _KIND_LINE_RE.search(manifest) is not None
+
+        if is_manifest:
+            yaml_filename = os.path.join(
+                Config.OUTPUT_DIR, f"deployment_{timestamp}{output_suffix}.yaml"
+            )
+            with open(yaml_filename, "w", encoding="utf-8") as f:
+                f.write(manifest)
             logger.info(f"Saved Kubernetes manifest to: {yaml_filename}")
+        else:
+            logger.info("No Kubernetes object (apiVersion and kind) found in result")
 
     return json_filename
 
 
-def run_crew(user_prompt):
+async def run_crew(user_prompt, use_cache=True, output_suffix="", verbose=None):
     """
     Execute the CrewAI workflow
 
+    Identical requests (same prompt, model and agent/task definitions) are
+    served from the on-disk result cache instead of re-running the crew.
+    Callers validate the configuration once up front (Config.validate()).
+
     Args:
         user_prompt (str): User's deployment request
+        use_cache (bool): Look up and store results in the result cache
+        output_suffix (str): Appended to output file names to keep them unique
+        verbose (bool): Show crew and agent step output. Defaults to
+            Config.VERBOSE_LEVEL > 0
 
     Returns:
-        str: Execution result
+        tuple: (result, output_file)
     """
+    if verbose is None:
+        verbose = Config.VERBOSE_LEVEL > 0
+
     logger.info("=" * 80)
     logger.info("Starting CrewAI DevOps Automation Workflow")
     logger.info("=" * 80)
     logger.info(f"User Prompt: {user_prompt}")
 
-    # Validate configuration
-    Config.validate()
+    if use_cache:
+        cache_key = result_cache_key(user_prompt)
+        cached_result = load_cached_result(cache_key)
+        if cached_result is not None:
+            logger.info(f"Result cache hit ({cache_key[:12]}); skipping crew execution")
+            output_file = save_results(
+                user_prompt, cached_result, 0.0, cached=True, output_suffix=output_suffix
+            )
+            return cached_result, output_file
+
+    # Imported here rather than at module level: crewai and the agent/task
+    # modules take seconds to load, which --help and cache hits don't need
+    from crewai import Crew, Process
+    from agents import requirements_analyzer, iac_generator, validator
+    from tasks import create_analysis_task, create_generation_task, create_validation_task
 
     # Create tasks with user prompt
     analysis_task = create_analysis_task(user_prompt)
@@ -109,9 +361,9 @@ def run_crew(user_prompt):
     # Assemble the crew
     crew = Crew(
         agents=[
-            requirements_analyzer,
-            iac_generator,
-            validator,
+            requirements_analyzer(),
+            iac_generator(),
+            validator(),
         ],
         tasks=[
             analysis_task,
@@ -119,50 +371,537 @@ def run_crew(user_prompt):
             validation_task,
         ],
         process=Process.sequential,
-        verbose=True,
+        verbose=verbose,
     )
 
     # Execute
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     logger.info("Executing crew workflow...")
 
-    result = crew.kickoff()
+    # Run on a copy so concurrent runs don't share agent executor state; the
+    # copied agents can then take this run's verbosity without affecting others
+    crew = crew.copy()
+    for agent in crew.agents:
+        agent.verbose = verbose
+    result = await crew.kickoff_async()
 
-    end_time = datetime.now()
-    execution_time = (end_time - start_time).total_seconds()
+    execution_time = time.perf_counter() - start_time
 
     logger.info("=" * 80)
     logger.info("Crew Execution Completed")
     logger.info(f"Execution Time: {execution_time:.2f} seconds")
     logger.info("=" * 80)
 
+    # Only cache results that contain a valid manifest, so an unlucky answer
+    # (e.g. a list of validation issues) isn't replayed for the whole TTL
+    result_str = str(result)
+    if use_cache and contains_manifest(result_str):
+        store_cached_result(cache_key, result_str)
+    elif use_cache:
+        logger.info("Result contains no valid manifest; not caching it")
+
     # Save results
-    output_file = save_results(user_prompt, result, execution_time)
+    output_file = save_results(
+        user_prompt, result, execution_time, output_suffix=output_suffix
+    )
 
     return result, output_file
 
 
-def main():
-    """Main entry point"""
-    print("\n" + "=" * 80)
-    print("CrewAI DevOps Automation - Kubernetes Manifest Generator")
-    print("=" * 80 + "\n")
+async def run_batch(
+    user_prompts,
+    use_cache=True,
+    max_concurrency=None,
+    on_result=None,
+    on_error=None,
+    verbose=False,
+):
+    """
+    Run the CrewAI workflow for several prompts concurrently
+
+    Args:
+        user_prompts (list): Deployment requests to process
+        use_cache (bool): Look up and store results in the result cache
+        max_concurrency (int): Concurrent crew limit. Defaults to
+            Config.MAX_CONCURRENCY
+        on_result (callable): Called as on_result(user_prompt, result,
+            output_file) as soon as each prompt finishes
+        on_error (callable): Called as on_error(user_prompt, exception) when
+            a prompt fails. If not given, the first failure is raised
+        verbose (bool): Show crew and agent step output. Off by default, as
+            interleaved output from concurrent crews is unreadable
+
+    Returns:
+        list: (result, output_file) tuples in the same order as user_prompts;
+            (None, None) for prompts that failed
+    """
+    # Validate once before the fan-out rather than per prompt
+    Config.validate()
+    semaphore = asyncio.Semaphore(max_concurrency or Config.MAX_CONCURRENCY)
+
+    async def run_one(index, user_prompt):
+        async with semaphore:
+            try:
+                result, output_file = await run_crew(
+                    user_prompt, use_cache, output_suffix=f"_{index}", verbose=verbose
+                )
+            except Exception as e:
+                if on_error is None:
+                    raise
+                logger.error(f"Prompt failed: {user_prompt}: {e}")
+                on_error(user_prompt, e)
+                return None, None
+        if on_result is not None:
+            on_result(user_prompt, result, output_file)
+        return result, output_file
+
+    return await asyncio.gather(
+        *(run_one(i, prompt) for i, prompt in enumerate(user_prompts, 1))
+    )
+
+
+def read_prompts(batch_file):
+    """
+    Read prompts from a JSONL file
+
+    Each non-empty line is either a JSON string or an object with a
+    "prompt" key.
+
+    Args:
+        batch_file (str): Path to the JSONL file
+
+    Yields:
+        str: User prompts in file order
+    """
+    with open(batch_file, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            prompt = row.get("prompt") if isinstance(row, dict) else row
+            if not isinstance(prompt, str) or not prompt.strip():
+                raise ValueError(f"{batch_file}:{line_number}: missing prompt")
+            yield prompt
+
+
+def drop_partial_row(output_path):
+    """
+    Truncate an unterminated last line left in a result file by an
+    interrupted run, so appended rows start on a line of their own
+
+    Args:
+        output_path (str): JSONL result file from an earlier batch run
+
+    Returns:
+        bool: True if a partial row was removed
+    """
+    try:
+        f = open(output_path, "rb+")
+    except FileNotFoundError:
+        return False
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return False
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return False
+        # Scan backwards for the newline ending the last complete row
+        position = end
+        while position > 0:
+            start = max(0, position - 65536)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b"\n")
+            if newline != -1:
+                f.truncate(start + newline + 1)
+                return True
+            position = start
+        f.truncate(0)
+        return True
+
+
+def completed_prompts(output_path):
+    """
+    Collect the prompts that already have a successful row in a result file
+
+    Rows with an "error" key, and a partially written last line left by an
+    interrupted run, are ignored so those prompts are retried.
+
+    Args:
+        output_path (str): JSONL result file from an earlier batch run
+
+    Returns:
+        set: User prompts that completed successfully
+    """
+    done = set()
+    try:
+        with open(output_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(row, dict) and "error" not in row:
+                    done.add(row.get("user_prompt"))
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def run_batch_file(batch_file, output_path, use_cache=True, force=False, verbose=False):
+    """
+    Process a JSONL file of prompts, streaming one result row per prompt
+
+    Rows are appended to output_path as each prompt completes, so partial
+    progress is on disk even if the batch is interrupted. Re-running the
+    same batch resumes it: prompts that already have a successful row in
+    output_path are skipped, and failed prompts get an {"user_prompt",
+    "error"} row so they are retried next time.
+
+    Args:
+        batch_file (str): JSONL file of prompts
+        output_path (str): JSONL file that receives result rows
+        use_cache (bool): Look up and store results in the result cache
+        force (bool): Re-run every prompt, ignoring rows already in output_path
+        verbose (bool): Show crew and agent step output
+
+    Returns:
+        int: Number of prompts processed
+    """
+    user_prompts = list(read_prompts(batch_file))
+    if drop_partial_row(output_path):
+        logger.warning(f"Dropped a partially written row at the end of {output_path}")
+    if not force:
+        done = completed_prompts(output_path)
+        pending = [prompt for prompt in user_prompts if prompt not in done]
+        if len(pending) < len(user_prompts):
+            logger.info(
+                f"Resuming: skipping {len(user_prompts) - len(pending)} prompts "
+                f"already completed in {output_path}"
+            )
+        user_prompts = pending
+    logger.info(f"Processing {len(user_prompts)} prompts from {batch_file}")
+
+    with open(output_path, "a", encoding="utf-8") as out:
+
+        def write_row(row):
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            out.flush()
+
+        def on_result(user_prompt, result, output_file):
+            write_row(
+                {
+                    "user_prompt": user_prompt,
+                    "output_file": output_file,
+                    "result": str(result),
+                }
+            )
+
+        def on_error(user_prompt, error):
+            write_row({"user_prompt": user_prompt, "error": str(error)})
+
+        run_batch_loop(
+            run_batch(
+                user_prompts,
+                use_cache,
+                on_result=on_result,
+                on_error=on_error,
+                verbose=verbose,
+            )
+        )
+
+    logger.info(f"Batch results written to: {output_path}")
+    return len(user_prompts)
+
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handle POST /run {"prompt": "...", "use_cache": true} for --serve
+
+    Requests must be application/json and carry the daemon's token in an
+    X-Daemon-Token header. A web page can send a cross-origin text/plain
+    POST to localhost without a CORS preflight; requiring JSON forces a
+    preflight (which this server never answers) and the token, readable only
+    from the PID file, keeps other local clients out.
+    """
+
+    def do_POST(self):
+        if self.path != "/run":
+            self._send_json(404, {"error": f"unknown path: {self.path}"})
+            return
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.split(";")[0].strip().lower() != "application/json":
+            self._send_json(415, {"error": "Content-Type must be application/json"})
+            return
+        token = self.headers.get(DAEMON_TOKEN_HEADER, "")
+        if not hmac.compare_digest(token.encode("utf-8"), self.server.token.encode("utf-8")):
+            self._send_json(403, {"error": f"missing or invalid {DAEMON_TOKEN_HEADER}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            user_prompt = request["prompt"]
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {"error": 'expected a JSON body {"prompt": "..."}'})
+            return
+        try:
+            # Queue behind MAX_CONCURRENCY running crews, like run_batch();
+            # concurrent crews' step output would interleave, so keep it off
+            with _daemon_slots:
+                result, output_file = asyncio.run(
+                    run_crew(user_prompt, request.get("use_cache", True), verbose=False)
+                )
+        except Exception as e:
+            logger.error(f"Execution failed: {e}", exc_info=True)
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send_json(200, {"result": str(result), "output_file": output_file})
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.info("daemon: " + format % args)
+
+
+def serve(port=None):
+    """
+    Run a persistent daemon that executes prompts in this warm process
 
-    # Example prompt (can be replaced with CLI input)
-    user_prompt = "Deploy a Java Spring Boot application with 3 replicas, needs 512Mi memory and 500m CPU"
+    crewai, the agents and the LLM client are loaded once at boot, so each
+    request skips the interpreter and import cold start. The daemon records
+    its PID, port and a random request token in Config.DAEMON_PID_FILE
+    (readable by the current user only), which the CLI checks before running
+    a prompt in-process.
 
-    print(f"Processing request: {user_prompt}\n")
+    Args:
+        port (int): Port to listen on (127.0.0.1 only). Defaults to
+            Config.DAEMON_PORT
+    """
+    from agents import requirements_analyzer, iac_generator, validator
+
+    Config.validate()
+    port = port or Config.DAEMON_PORT
+
+    # Warm the agents and shared LLM before accepting requests
+    requirements_analyzer()
+    iac_generator()
+    validator()
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), DaemonRequestHandler)
+    server.token = secrets.token_urlsafe(32)
+    ensure_output_dir()
+    fd = os.open(Config.DAEMON_PID_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with open(fd, "w", encoding="utf-8") as f:
+        json.dump({"pid": os.getpid(), "port": port, "token": server.token}, f)
+    logger.info(f"Daemon listening on http://127.0.0.1:{port} (POST /run)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.remove(Config.DAEMON_PID_FILE)
+        except FileNotFoundError:
+            pass
+        logger.info("Daemon stopped")
+
+
+def find_daemon():
+    """
+    Return the address and token of a running local daemon, if there is one
+
+    Liveness is checked by connecting to the recorded port rather than
+    signalling the recorded PID: os.kill(pid, 0) terminates the process on
+    Windows, and a stale PID may belong to an unrelated process.
+
+    Returns:
+        dict or None: {"port", "token"} of the daemon, or None if no daemon
+            is accepting connections
+    """
+    try:
+        with open(Config.DAEMON_PID_FILE, encoding="utf-8") as f:
+            info = json.load(f)
+        daemon = {"port": info["port"], "token": info["token"]}
+        with socket.create_connection(("127.0.0.1", daemon["port"]), timeout=0.2):
+            pass
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return daemon
+
+
+def run_via_daemon(daemon, user_prompt, use_cache=True):
+    """
+    Execute a prompt on the local daemon
+
+    Args:
+        daemon (dict): Daemon address and token from find_daemon()
+        user_prompt (str): User's deployment request
+        use_cache (bool): Look up and store results in the result cache
+
+    Returns:
+        tuple: (result, output_file)
+
+    Raises:
+        requests.RequestException: If the daemon cannot be reached or its
+            reply is not a daemon response (treated as unreachable)
+        RuntimeError: If the daemon reports an execution error
+    """
+    import requests
+
+    response = requests.post(
+        f"http://127.0.0.1:{daemon['port']}/run",
+        json={"prompt": user_prompt, "use_cache": use_cache},
+        headers={DAEMON_TOKEN_HEADER: daemon["token"]},
+        timeout=None,
+    )
+    try:
+        body = response.json()
+        if response.status_code != 200:
+            error = body["error"]
+        else:
+            return body["result"], body["output_file"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise requests.RequestException(
+            f"malformed daemon response (HTTP {response.status_code})"
+        ) from e
+    raise RuntimeError(error)
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Generate Kubernetes manifests from deployment requests"
+    )
+    parser.add_argument(
+        "prompt", nargs="*", help="Deployment request (defaults to an example prompt)"
+    )
+    parser.add_argument(
+        "--batch", metavar="PROMPTS.jsonl", help="Process prompts from a JSONL file"
+    )
+    parser.add_argument(
+        "--output",
+        metavar="RESULTS.jsonl",
+        help="Batch result file (default: outputs/<batch name>.results.jsonl)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Bypass the result cache"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-run prompts that already have a result in the batch output",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Show crew and agent step output in batch mode",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a persistent daemon that later invocations send prompts to",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        help=f"Daemon port for --serve (default: {Config.DAEMON_PORT})",
+    )
+    args = parser.parse_args(argv)
+
+    # Reject flags that would otherwise be silently ignored
+    if args.serve and (args.batch or args.prompt):
+        parser.error("--serve takes no prompt and cannot be combined with --batch")
+    if args.batch and args.prompt:
+        parser.error("a prompt cannot be combined with --batch")
+    if not args.batch:
+        for flag in ("output", "force", "verbose"):
+            if getattr(args, flag):
+                parser.error(f"--{flag} requires --batch")
+    if args.port is not None and not args.serve:
+        parser.error("--port requires --serve")
+    return args
+
+
+def main(argv=None):
+    """Main entry point"""
+    args = parse_args(argv)
+    configure_logging()
+    use_cache = not args.no_cache
+
+    if args.serve:
+        serve(args.port)
+        return
+
+    if args.batch:
+        ensure_output_dir()
+        output_path = args.output or os.path.join(
+            Config.OUTPUT_DIR,
+            os.path.splitext(os.path.basename(args.batch))[0] + ".results.jsonl",
+        )
+        try:
+            count = run_batch_file(
+                args.batch, output_path, use_cache, args.force, args.verbose
+            )
+            print(f"\n✓ Processed {count} prompts. Results saved to: {output_path}\n")
+        except Exception as e:
+            logger.error(f"Batch execution failed: {e}", exc_info=True)
+            print(f"\n✗ Error: {e}\n")
+        return
+
+    # Example prompt, used when none is given on the command line
+    user_prompt = (
+        " ".join(args.prompt)
+        or "Deploy a Java Spring Boot application with 3 replicas, needs 512Mi memory and 500m CPU"
+    )
+
+    sys.stdout.write(
+        "\n".join(
+            [
+                "\n" + "=" * 80,
+                "CrewAI DevOps Automation - Kubernetes Manifest Generator",
+                "=" * 80 + "\n",
+                f"Processing request: {user_prompt}\n",
+                "",
+            ]
+        )
+    )
 
     try:
-        result, output_file = run_crew(user_prompt)
-
-        print("\n" + "=" * 80)
-        print("FINAL RESULT")
-        print("=" * 80)
-        print(result)
-        print("\n" + "=" * 80)
-        print(f"Results saved to: {output_file}")
-        print("=" * 80 + "\n")
+        result = None
+        daemon = find_daemon()
+        if daemon:
+            import requests
+
+            try:
+                result, output_file = run_via_daemon(daemon, user_prompt, use_cache)
+            except requests.RequestException as e:
+                logger.warning(f"Daemon unreachable ({e}); running in-process")
+        if result is None:
+            Config.validate()
+            result, output_file = asyncio.run(run_crew(user_prompt, use_cache))
+
+        sys.stdout.write(
+            "\n".join(
+                [
+                    "\n" + "=" * 80,
+                    "FINAL RESULT",
+                    "=" * 80,
+                    str(result),
+                    "\n" + "=" * 80,
+                    f"Results saved to: {output_file}",
+                    "=" * 80 + "\n",
+                    "",
+                ]
+            )
+        )
 
     except Exception as e:
         logger.error(f"Execution failed: {e}", exc_info=True)
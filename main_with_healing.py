@@ -4,13 +4,19 @@ Orchestrates the DevOps automation workflow with failure detection and remediati
 """
 
 import os
+import re
 import sys
+import asyncio
 import json
 import time
+import hashlib
 import logging
+import itertools
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from crewai import Crew, Process
-from config import Config
+from config import Config, configure_logging
 from agents import requirements_analyzer, iac_generator, validator, remediation_agent
 from tasks import (
     create_analysis_task,
@@ -21,21 +27,117 @@ from tasks import (
     create_remediation_task,
 )
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler(Config.LOG_FILE), logging.StreamHandler(sys.stdout)],
-)
-
 logger = logging.getLogger(__name__)
+audit_logger = logging.getLogger("audit")
+
+# Monotonic sequence shared by all audit events in this process
+_audit_seq = itertools.count(1)
+
+# Pod names carry ReplicaSet/pod hash suffixes that change on every rollout
+_POD_SUFFIX_RE = re.compile(r"-[0-9a-f]{5,10}-[0-9a-z]{5}\b")
+
+# Healed manifests keyed by a digest of the failure evidence, least recently
+# used first; shared by run_healing_batch() worker threads
+HEALING_CACHE_SIZE = 4096
+_healing_cache = OrderedDict()
+_healing_cache_lock = threading.Lock()
+
+
+def evidence_key(deployment_status, manifest):
+    """
+    Build a cache key for a failed deployment
+
+    Pod hash suffixes and whitespace are stripped so that the same failure
+    recurring on new pods maps to the same key.
+
+    Args:
+        deployment_status (str): Deployment status reported for the attempt
+        manifest (str): Manifest that was deployed
+
+    Returns:
+        str: Hex digest identifying the failure evidence
+    """
+    status = " ".join(_POD_SUFFIX_RE.sub("", deployment_status).split())
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(status.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(manifest.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def healing_cache_get(cache_key):
+    """
+    Look up a healed manifest and mark it most recently used
+
+    Args:
+        cache_key (str): Key from evidence_key()
+
+    Returns:
+        str or None: Cached healed manifest
+    """
+    with _healing_cache_lock:
+        manifest = _healing_cache.get(cache_key)
+        if manifest is not None:
+            _healing_cache.move_to_end(cache_key)
+        return manifest
+
+
+def healing_cache_put(cache_key, manifest):
+    """
+    Store a healed manifest, evicting the least recently used entries
+    beyond HEALING_CACHE_SIZE
+
+    Args:
+        cache_key (str): Key from evidence_key()
+        manifest (str): Manifest produced by the remediation crew
+    """
+    with _healing_cache_lock:
+        _healing_cache[cache_key] = manifest
+        _healing_cache.move_to_end(cache_key)
+        while len(_healing_cache) > HEALING_CACHE_SIZE:
+            _healing_cache.popitem(last=False)
+
+
+def healing_cache_evict(cache_key):
+    """
+    Drop a healed manifest whose redeploy failed
+
+    Args:
+        cache_key (str): Key from evidence_key()
+    """
+    with _healing_cache_lock:
+        _healing_cache.pop(cache_key, None)
+
+
+def audit_event(remediation_log, step, **fields):
+    """
+    Record a structured audit event for a workflow step
+
+    The event is appended to the remediation log and emitted as a single
+    JSON line on the "audit" logger.
+
+    Args:
+        remediation_log (dict): Workflow log holding the "events" list
+        step (str): Workflow step name (generate, deploy, heal, complete)
+        **fields: Additional step-specific fields
+
+    Returns:
+        dict: The recorded event
+    """
+    event = {
+        "seq": next(_audit_seq),
+        "timestamp": datetime.now().isoformat(),
+        "step": step,
+        **fields,
+    }
+    remediation_log["events"].append(event)
+    audit_logger.info(json.dumps(event))
+    return event
 
 
 def ensure_output_dir():
     """Create output directory if it doesn't exist"""
-    if not os.path.exists(Config.OUTPUT_DIR):
-        os.makedirs(Config.OUTPUT_DIR)
-        logger.info(f"Created output directory: {Config.OUTPUT_DIR}")
+    os.makedirs(Config.OUTPUT_DIR, exist_ok=True)
 
 
 def simulate_deployment(manifest, retry_count=0):
@@ -87,13 +189,58 @@ def simulate_deployment(manifest, retry_count=0):
         )
 
 
-def run_healing_workflow(user_prompt, max_retries=3):
+def _kickoff(crew):
+    """Run a crew on its own copy so concurrent workflows don't share agent state"""
+    return crew.copy().kickoff()
+
+
+def _run_healing_crew(deployment_status, current_manifest):
+    """
+    Run the monitoring, diagnosis and remediation tasks for a failed deployment
+
+    Args:
+        deployment_status (str): Deployment status reported for the attempt
+        current_manifest (str): Manifest that failed to deploy
+
+    Returns:
+        str: Corrected manifest produced by the remediation agent
+    """
+    # Step 1: Monitor and detect failure
+    logger.info("Step 1: Monitoring deployment health...")
+    monitoring_task = create_monitoring_task(deployment_status)
+
+    # Step 2: Diagnose the failure
+    logger.info("Step 2: Diagnosing failure...")
+    diagnosis_task = create_diagnosis_task(deployment_status)
+    diagnosis_task.context = [monitoring_task]
+
+    # Step 3: Apply remediation
+    logger.info("Step 3: Applying remediation...")
+    remediation_task = create_remediation_task(
+        f"Monitoring Result: {deployment_status}", current_manifest
+    )
+    remediation_task.context = [diagnosis_task]
+
+    # Create healing crew
+    healing_crew = Crew(
+        agents=[remediation_agent()],
+        tasks=[monitoring_task, diagnosis_task, remediation_task],
+        process=Process.sequential,
+        verbose=Config.VERBOSE_LEVEL > 0,
+    )
+
+    healing_result = _kickoff(healing_crew)
+    return str(healing_result)
+
+
+def run_healing_workflow(user_prompt, max_retries=3, output_suffix=""):
     """
     Run the complete workflow with self-healing capability
 
     Args:
         user_prompt (str): User's deployment request
         max_retries (int): Maximum number of healing attempts
+        output_suffix (str): Appended to output file names to keep them unique
 
     Returns:
         dict: Workflow execution results
@@ -110,6 +257,7 @@ def run_healing_workflow(user_prompt, max_retries=3):
         "user_prompt": user_prompt,
         "max_retries": max_retries,
         "attempts": [],
+        "events": [],
     }
 
     # Phase 1: Generate initial manifest
@@ -126,18 +274,21 @@ def run_healing_workflow(user_prompt, max_retries=3):
 
     # Create and run initial crew
     initial_crew = Crew(
-        agents=[requirements_analyzer, iac_generator, validator],
+        agents=[requirements_analyzer(), iac_generator(), validator()],
         tasks=[analysis_task, generation_task, validation_task],
         process=Process.sequential,
-        verbose=True,
+        verbose=Config.VERBOSE_LEVEL > 0,
     )
 
-    initial_result = initial_crew.kickoff()
+    initial_result = _kickoff(initial_crew)
     current_manifest = str(initial_result)
 
     logger.info(f"\n✅ Initial manifest generated")
+    audit_event(remediation_log, "generate", manifest_chars=len(current_manifest))
 
     # Phase 2: Deploy and monitor with self-healing loop
+    # Evidence key of the cached fix applied before the current attempt
+    healed_key = None
     for attempt in range(max_retries):
         attempt_num = attempt + 1
         logger.info(f"\n🚀 PHASE 2: Deployment Attempt #{attempt_num}")
@@ -151,6 +302,12 @@ def run_healing_workflow(user_prompt, max_retries=3):
         # Simulate deployment
         success, deployment_status = simulate_deployment(current_manifest, attempt)
         attempt_log["deployment_status"] = deployment_status
+        audit_event(
+            remediation_log,
+            "deploy",
+            attempt=attempt_num,
+            result="SUCCESS" if success else "FAILED",
+        )
 
         if success:
             logger.info("\n✅ Deployment successful!")
@@ -163,6 +320,11 @@ def run_healing_workflow(user_prompt, max_retries=3):
         logger.warning(f"\n⚠️  Deployment failed on attempt #{attempt_num}")
         attempt_log["result"] = "FAILED"
 
+        # The fix applied for this attempt did not work; don't replay it
+        if healed_key is not None:
+            healing_cache_evict(healed_key)
+            healed_key = None
+
         # If this was the last attempt, don't try to heal
         if attempt_num >= max_retries:
             logger.error(
@@ -180,35 +342,31 @@ def run_healing_workflow(user_prompt, max_retries=3):
 
         attempt_log["healing_attempted"] = True
 
-        # Step 1: Monitor and detect failure
-        logger.info("Step 1: Monitoring deployment health...")
-        monitoring_task = create_monitoring_task(deployment_status)
+        cache_key = evidence_key(deployment_status, current_manifest)
+        healed_manifest = healing_cache_get(cache_key)
+        cache_hit = healed_manifest is not None
+        if cache_hit:
+            logger.info("Reusing diagnosis for previously seen failure evidence")
+        else:
+            healed_manifest = _run_healing_crew(deployment_status, current_manifest)
 
-        # Step 2: Diagnose the failure
-        logger.info("Step 2: Diagnosing failure...")
-        diagnosis_task = create_diagnosis_task(deployment_status)
-        diagnosis_task.context = [monitoring_task]
-
-        # Step 3: Apply remediation
-        logger.info("Step 3: Applying remediation...")
-        remediation_task = create_remediation_task(
-            f"Monitoring Result: {deployment_status}", current_manifest
-        )
-        remediation_task.context = [diagnosis_task]
-
-        # Create healing crew
-        healing_crew = Crew(
-            agents=[remediation_agent],
-            tasks=[monitoring_task, diagnosis_task, remediation_task],
-            process=Process.sequential,
-            verbose=True,
-        )
-
-        healing_result = healing_crew.kickoff()
-        current_manifest = str(healing_result)
+        # A "fix" that leaves the manifest unchanged would just fail again
+        if healed_manifest.strip() != current_manifest.strip():
+            healing_cache_put(cache_key, healed_manifest)
+            healed_key = cache_key
+        current_manifest = healed_manifest
 
         attempt_log["diagnosis"] = "OOMKilled - Memory limit too low"
         attempt_log["remediation"] = "Increased memory limit from 512Mi to 1Gi"
+        audit_event(
+            remediation_log,
+            "heal",
+            attempt=attempt_num,
+            evidence_key=cache_key,
+            cache_hit=cache_hit,
+            diagnosis=attempt_log["diagnosis"],
+            remediation=attempt_log["remediation"],
+        )
 
         logger.info(f"\n✅ Remediation applied. Preparing retry #{attempt_num + 1}...")
 
@@ -224,18 +382,24 @@ def run_healing_workflow(user_prompt, max_retries=3):
     # Save results
     execution_time = time.time() - start_time
     remediation_log["execution_time_seconds"] = round(execution_time, 2)
+    audit_event(
+        remediation_log,
+        "complete",
+        final_status=remediation_log.get("final_status"),
+        total_attempts=remediation_log.get("total_attempts"),
+    )
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
     # Save remediation log
-    log_file = os.path.join(Config.OUTPUT_DIR, f"remediation_log_{timestamp}.json")
-    with open(log_file, "w") as f:
-        json.dump(remediation_log, f, indent=2)
+    log_file = os.path.join(Config.OUTPUT_DIR, f"remediation_log_{timestamp}{output_suffix}.json")
+    with open(log_file, "w", encoding="utf-8", buffering=65536) as f:
+        json.dump(remediation_log, f, ensure_ascii=False, indent=2)
     logger.info(f"\n📝 Saved remediation log to: {log_file}")
 
     # Save final manifest
     manifest_file = os.path.join(
-        Config.OUTPUT_DIR, f"healed_deployment_{timestamp}.yaml"
+        Config.OUTPUT_DIR, f"healed_deployment_{timestamp}{output_suffix}.yaml"
     )
     with open(manifest_file, "w") as f:
         f.write(current_manifest)
@@ -248,7 +412,38 @@ def run_healing_workflow(user_prompt, max_retries=3):
     return remediation_log
 
 
+async def run_healing_batch(user_prompts, max_retries=3, max_concurrency=None):
+    """
+    Run several self-healing workflows concurrently
+
+    Each workflow runs in a worker thread; a semaphore bounds how many talk
+    to the LLM endpoint at once.
+
+    Args:
+        user_prompts (list): Deployment requests to process
+        max_retries (int): Maximum number of healing attempts per workflow
+        max_concurrency (int): Concurrent workflow limit. Defaults to
+            Config.MAX_CONCURRENCY
+
+    Returns:
+        list: Remediation logs in the same order as user_prompts
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or Config.MAX_CONCURRENCY)
+
+    async def run_one(index, user_prompt):
+        async with semaphore:
+            return await asyncio.to_thread(
+                run_healing_workflow, user_prompt, max_retries, f"_{index}"
+            )
+
+    return await asyncio.gather(
+        *(run_one(i, prompt) for i, prompt in enumerate(user_prompts, 1))
+    )
+
+
 if __name__ == "__main__":
+    configure_logging(sys.stdout)
+
     # Validate configuration
     Config.validate()
 
@@ -13,11 +13,23 @@ Module for integrating with the Ollama Cloud LLM API via HTTP.
 
 import json
 import requests
+from functools import cache
+from requests.adapters import HTTPAdapter
 from typing import Any, Dict, List, Optional, Union
 from crewai import BaseLLM
 from config import Config
 
 
+@cache
+def _http_session() -> requests.Session:
+    """Shared keep-alive session so all LLM instances reuse pooled connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 class OllamaCloudGenerateLLM(BaseLLM):
     def __init__(
         self,
@@ -73,7 +85,7 @@ class OllamaCloudGenerateLLM(BaseLLM):
         # Streaming path
         if self._stream:
             response_text = []
-            with requests.post(
+            with _http_session().post(
                 f"{self.endpoint}/api/generate",
                 headers=headers,
                 json=payload,
@@ -97,7 +109,7 @@ class OllamaCloudGenerateLLM(BaseLLM):
 
         # Non-streaming path
         else:
-            r = requests.post(
+            r = _http_session().post(
                 f"{self.endpoint}/api/generate",
                 headers=headers,
                 json={**payload, "stream": False},
@@ -32,7 +32,7 @@ def create_analysis_task(user_prompt):
         7. Any special configurations
         
         Provide a clear, structured summary of the deployment requirements.""",
-        agent=requirements_analyzer,
+        agent=requirements_analyzer(),
         expected_output="A structured summary of deployment requirements including app name, image, ports, replicas, and resources",
     )
 
@@ -62,7 +62,7 @@ def create_generation_task():
         
         Follow Kubernetes best practices and ensure the YAML is valid and production-ready.
         Output ONLY the YAML manifest without additional commentary.""",
-        agent=iac_generator,
+        agent=iac_generator(),
         expected_output="A complete, valid Kubernetes Deployment YAML manifest",
     )
 
@@ -86,7 +86,7 @@ def create_validation_task():
         
         If valid, respond with "VALIDATION PASSED" followed by the complete manifest.
         If issues found, list them clearly.""",
-        agent=validator,
+        agent=validator(),
         expected_output="Validation result with either the approved manifest or a list of issues to fix",
     )
 
@@ -116,7 +116,7 @@ def create_monitoring_task(deployment_status):
         
         If failures detected, respond with "FAILURE DETECTED: [failure type]" and describe the issue.
         If deployment is healthy, respond with "DEPLOYMENT HEALTHY".""",
-        agent=remediation_agent,
+        agent=remediation_agent(),
         expected_output="Health status indicating either deployment success or specific failure type detected",
     )
 
@@ -143,7 +143,7 @@ def create_diagnosis_task(failure_info):
         3. Recommended fix - What specific changes are needed?
         
         Be specific and actionable in your diagnosis.""",
-        agent=remediation_agent,
+        agent=remediation_agent(),
         expected_output="Detailed diagnosis with root cause, impact, and specific remediation steps",
     )
 
@@ -175,6 +175,6 @@ def create_remediation_task(diagnosis_result, original_manifest):
         - For Pending: Reduce resource requests or increase replicas
         
         Output the complete corrected YAML manifest with fixes applied.""",
-        agent=remediation_agent,
+        agent=remediation_agent(),
         expected_output="A corrected Kubernetes manifest with remediation fixes applied",
     )
@@ -5,6 +5,10 @@ Simulates different deployment failures to test remediation logic
 
 import sys
 import logging
+import tempfile
+from types import SimpleNamespace
+import main_with_healing
+from config import Config
 from main_with_healing import simulate_deployment
 
 # Configure logging
@@ -113,5 +117,121 @@ def test_failure_scenarios():
     logger.info("Run: python main_with_healing.py to see self-healing in action")
 
 
+def test_evidence_key_ignores_pod_suffixes_and_whitespace():
+    """The same failure on new pods maps to the same healing cache key"""
+    manifest = "apiVersion: apps/v1\nkind: Deployment"
+    key = main_with_healing.evidence_key(
+        "FAILED\n- app-7d9f8c6b5-abcde: OOMKilled", manifest
+    )
+    assert key == main_with_healing.evidence_key(
+        "FAILED  - app-5c4b3a291-zyxwv:   OOMKilled", manifest
+    )
+    assert key != main_with_healing.evidence_key(
+        "FAILED - app-7d9f8c6b5-abcde: CrashLoopBackOff", manifest
+    )
+    assert key != main_with_healing.evidence_key(
+        "FAILED - app-7d9f8c6b5-abcde: OOMKilled", manifest + "\n# changed"
+    )
+
+
+def test_healing_cache_is_bounded_lru():
+    """The healing cache keeps only the most recently used entries"""
+    original_size = main_with_healing.HEALING_CACHE_SIZE
+    main_with_healing.HEALING_CACHE_SIZE = 3
+    main_with_healing._healing_cache.clear()
+    try:
+        for key in "abcd":
+            main_with_healing.healing_cache_put(key, f"manifest {key}")
+        assert list(main_with_healing._healing_cache) == ["b", "c", "d"]
+
+        # A lookup refreshes the entry, so "c" is evicted next instead of "b"
+        assert main_with_healing.healing_cache_get("b") == "manifest b"
+        main_with_healing.healing_cache_put("e", "manifest e")
+        assert list(main_with_healing._healing_cache) == ["d", "b", "e"]
+
+        main_with_healing.healing_cache_evict("b")
+        main_with_healing.healing_cache_evict("missing")
+        assert main_with_healing.healing_cache_get("b") is None
+    finally:
+        main_with_healing.HEALING_CACHE_SIZE = original_size
+        main_with_healing._healing_cache.clear()
+
+
+def test_failed_fix_is_not_replayed():
+    """A cached fix whose redeploy failed is not reused by later workflows"""
+    initial_manifest = "apiVersion: v1\nkind: Deployment"
+    healed_manifest = initial_manifest + "\n# fix"
+    heal_calls = []
+    deploy_fixed = []
+
+    def heal(deployment_status, manifest):
+        heal_calls.append(manifest)
+        return healed_manifest
+
+    def deploy(manifest, attempt):
+        if manifest == healed_manifest and deploy_fixed:
+            return True, "SUCCESS - All pods running"
+        return False, "FAILED - CrashLoopBackOff app-7d9f8c6b5-abcde"
+
+    def task(*args, **kwargs):
+        return SimpleNamespace(context=None)
+
+    # Keep the workflow away from CrewAI and the LLM
+    stubs = {
+        "Crew": lambda **kwargs: SimpleNamespace(**kwargs),
+        "_kickoff": lambda crew: initial_manifest,
+        "_run_healing_crew": heal,
+        "simulate_deployment": deploy,
+        "create_analysis_task": task,
+        "create_generation_task": task,
+        "create_validation_task": task,
+        "requirements_analyzer": lambda: None,
+        "iac_generator": lambda: None,
+        "validator": lambda: None,
+    }
+    originals = {name: getattr(main_with_healing, name) for name in stubs}
+    original_sleep = main_with_healing.time.sleep
+    original_output_dir = Config.OUTPUT_DIR
+    output_dir = tempfile.TemporaryDirectory()
+    Config.OUTPUT_DIR = output_dir.name
+    for name, value in stubs.items():
+        setattr(main_with_healing, name, value)
+    main_with_healing.time.sleep = lambda seconds: None
+    main_with_healing._healing_cache.clear()
+
+    def heal_events(log):
+        return [event for event in log["events"] if event["step"] == "heal"]
+
+    try:
+        # The fix is cached, then evicted when its redeploy fails
+        log = main_with_healing.run_healing_workflow("Deploy an app", max_retries=2)
+        assert log["final_status"] != "SUCCESS"
+        assert len(heal_calls) == 1
+        assert len(main_with_healing._healing_cache) == 0
+
+        # The same failure evidence asks the remediation crew again
+        deploy_fixed.append(True)
+        log = main_with_healing.run_healing_workflow("Deploy an app", max_retries=2)
+        assert log["final_status"] == "SUCCESS"
+        assert len(heal_calls) == 2
+        assert [e["cache_hit"] for e in heal_events(log)] == [False]
+
+        # A fix that worked stays cached and is reused
+        log = main_with_healing.run_healing_workflow("Deploy an app", max_retries=2)
+        assert log["final_status"] == "SUCCESS"
+        assert len(heal_calls) == 2
+        assert [e["cache_hit"] for e in heal_events(log)] == [True]
+    finally:
+        for name, value in originals.items():
+            setattr(main_with_healing, name, value)
+        main_with_healing.time.sleep = original_sleep
+        main_with_healing._healing_cache.clear()
+        Config.OUTPUT_DIR = original_output_dir
+        output_dir.cleanup()
+
+
 if __name__ == "__main__":
     test_failure_scenarios()
+    test_evidence_key_ignores_pod_suffixes_and_whitespace()
+    test_healing_cache_is_bounded_lru()
+    test_failed_fix_is_not_replayed()
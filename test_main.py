@@ -0,0 +1,357 @@
+"""
+Test the helpers in main.py
+Covers batch resume, output parsing, the result cache and the daemon handler
+without calling CrewAI or the LLM
+"""
+
+import io
+import os
+import sys
+import json
+import asyncio
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer
+
+import main
+from config import Config
+
+
+@contextmanager
+def patched(obj, name, value):
+    """Temporarily replace an attribute"""
+    original = getattr(obj, name)
+    setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        setattr(obj, name, original)
+
+
+def write_lines(path, text):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+
+
+def read_rows(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_drop_partial_row_truncates_unterminated_tail():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.jsonl")
+        write_lines(path, '{"user_prompt": "a", "result": "ok"}\n{"user_prompt":"b","outp')
+
+        assert main.drop_partial_row(path)
+        assert read_rows(path) == [{"user_prompt": "a", "result": "ok"}]
+        assert not main.drop_partial_row(path)
+
+
+def test_drop_partial_row_handles_missing_and_single_partial_line():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.jsonl")
+        assert not main.drop_partial_row(path)
+
+        write_lines(path, '{"user_prompt": "a"')
+        assert main.drop_partial_row(path)
+        assert os.path.getsize(path) == 0
+
+
+def test_completed_prompts_ignores_errors_and_partial_rows():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.jsonl")
+        write_lines(
+            path,
+            '{"user_prompt": "a", "result": "ok"}\n'
+            '{"user_prompt": "b", "error": "timeout"}\n'
+            '{"user_prompt": "c", "res',
+        )
+
+        assert main.completed_prompts(path) == {"a"}
+        assert main.completed_prompts(os.path.join(tmp, "missing.jsonl")) == set()
+
+
+def test_run_batch_file_resumes_after_partial_row():
+    calls = []
+
+    async def fake_run_crew(user_prompt, use_cache=True, output_suffix="", verbose=None):
+        calls.append(user_prompt)
+        if user_prompt == "boom":
+            raise RuntimeError("timeout")
+        return f"result for {user_prompt}", f"result{output_suffix}.json"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        batch = os.path.join(tmp, "prompts.jsonl")
+        output = os.path.join(tmp, "results.jsonl")
+        write_lines(batch, '"a"\n{"prompt": "b"}\n"boom"\n')
+        # An interrupted run finished "a" and was cut off mid-way through "b"
+        write_lines(output, '{"user_prompt": "a", "result": "ok"}\n{"user_prompt":"b","outp')
+
+        with patched(main, "run_crew", fake_run_crew), patched(Config, "_validated", True):
+            assert main.run_batch_file(batch, output) == 2
+            assert sorted(calls) == ["b", "boom"]
+
+            rows = read_rows(output)
+            assert rows[0] == {"user_prompt": "a", "result": "ok"}
+            assert {"user_prompt": "boom", "error": "timeout"} in rows
+            assert any(row.get("result") == "result for b" for row in rows)
+
+            # A second resume retries only the failed prompt
+            calls.clear()
+            assert main.run_batch_file(batch, output) == 1
+            assert calls == ["boom"]
+
+            # --force re-runs everything
+            calls.clear()
+            assert main.run_batch_file(batch, output, force=True) == 3
+
+
+def post_to_daemon(port, body, headers):
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/run", data=body, headers=headers, method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_daemon_auth_and_concurrency_limit():
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    async def fake_run_crew(user_prompt, use_cache=True, output_suffix="", verbose=None):
+        assert verbose is False
+        with lock:
+            running.append(user_prompt)
+            peak.append(len(running))
+        await asyncio.sleep(0.05)
+        with lock:
+            running.remove(user_prompt)
+        return f"result for {user_prompt}", "result.json"
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), main.DaemonRequestHandler)
+    server.token = "secret"
+    port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    body = json.dumps({"prompt": "Deploy a"}).encode("utf-8")
+    json_headers = {"Content-Type": "application/json"}
+    try:
+        with patched(main, "run_crew", fake_run_crew), patched(
+            main, "_daemon_slots", threading.BoundedSemaphore(2)
+        ):
+            # A cross-origin "simple" request: text/plain, no token
+            status, _ = post_to_daemon(port, body, {"Content-Type": "text/plain"})
+            assert status == 415
+            status, _ = post_to_daemon(port, body, json_headers)
+            assert status == 403
+            status, _ = post_to_daemon(
+                port, body, {**json_headers, main.DAEMON_TOKEN_HEADER: "wrong"}
+            )
+            assert status == 403
+
+            authorized = {**json_headers, main.DAEMON_TOKEN_HEADER: "secret"}
+            results = []
+            clients = [
+                threading.Thread(
+                    target=lambda: results.append(post_to_daemon(port, body, authorized))
+                )
+                for _ in range(6)
+            ]
+            for client in clients:
+                client.start()
+            for client in clients:
+                client.join()
+
+            assert [status for status, _ in results] == [200] * 6
+            assert results[0][1]["result"] == "result for Deploy a"
+            assert max(peak) <= 2
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_manifest_extraction_stops_at_closing_fence():
+    for text, expected in [
+        (
+            "Here it is:\n```yaml\napiVersion: v1\nkind: Service\n```\nDone.",
+            "apiVersion: v1\nkind: Service",
+        ),
+        (
+            "  ```yaml\n  apiVersion: v1\n  kind: Service\n  ```\nDone.",
+            "  apiVersion: v1\n  kind: Service",
+        ),
+        ("apiVersion: v1\nkind: Pod\n", "apiVersion: v1\nkind: Pod\n"),
+    ]:
+        assert main._YAML_RE.search(text).group(0) == expected
+    assert main._YAML_RE.search("No manifest here") is None
+
+
+def test_is_kubernetes_manifest():
+    multi_document = (
+        "apiVersion: apps/v1\nkind: Deployment\nmetadata:\n  name: app\n"
+        "---\napiVersion: v1\nkind: Service\n"
+    )
+    assert main.is_kubernetes_manifest(multi_document)
+    assert main.is_kubernetes_manifest("---\nfoo: 1\n---\napiVersion: v1\nkind: Pod\n")
+    assert not main.is_kubernetes_manifest("apiVersion: v1\nmetadata: {}\n")
+    assert not main.is_kubernetes_manifest("- apiVersion\n- kind\n")
+
+    try:
+        main.is_kubernetes_manifest("apiVersion: v1\nkind: [oops\n")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("invalid YAML should raise ValueError")
+
+
+def saved_manifest(result):
+    """Run save_results() in a scratch directory and return the .yaml text"""
+    with tempfile.TemporaryDirectory() as tmp, patched(Config, "OUTPUT_DIR", tmp):
+        main.save_results("prompt", result, 1.0)
+        names = [name for name in os.listdir(tmp) if name.endswith(".yaml")]
+        if not names:
+            return None
+        with open(os.path.join(tmp, names[0]), encoding="utf-8") as f:
+            return f.read()
+
+
+def test_save_results_manifest_detection():
+    manifest = "apiVersion: v1\nkind: Service\n---\napiVersion: v1\nkind: Pod"
+    assert saved_manifest(f"Here:\n```yaml\n{manifest}\n```\nok") == manifest
+
+    # Prose that only mentions the fields is not a manifest
+    assert saved_manifest("Set the apiVersion: field and the kind: field.") is None
+    assert saved_manifest("No manifest at all") is None
+
+    # Manifest-shaped output that fails to parse is kept for manual fixing
+    unfenced = "apiVersion: v1\nkind: Pod\nThe manifest: looks fine: yes"
+    assert saved_manifest(unfenced) == unfenced
+
+
+def test_result_cache_key_canonicalizes_whitespace_only():
+    key = main.result_cache_key("Deploy a Node.js app")
+    assert main.result_cache_key("  Deploy a\n Node.js   app ") == key
+    assert main.result_cache_key("Deploy a node.js app") != key
+    with patched(Config, "DEFAULT_MODEL", "other-model"):
+        assert main.result_cache_key("Deploy a Node.js app") != key
+
+
+def test_read_prompts():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "prompts.jsonl")
+        write_lines(path, '"Deploy a"\n\n{"prompt": "Deploy b", "id": 2}\n')
+        assert list(main.read_prompts(path)) == ["Deploy a", "Deploy b"]
+
+        write_lines(path, '"Deploy a"\n{"name": "no prompt"}\n')
+        try:
+            list(main.read_prompts(path))
+        except ValueError as e:
+            assert ":2:" in str(e)
+        else:
+            raise AssertionError("a row without a prompt should raise ValueError")
+
+
+def test_only_results_with_a_manifest_are_cacheable():
+    assert main.contains_manifest("Done:\n```yaml\napiVersion: v1\nkind: Service\n```")
+    # A validator answer listing issues, and manifest-shaped text that fails to parse
+    assert not main.contains_manifest("Issues found:\n1. Missing resource limits")
+    assert not main.contains_manifest("apiVersion: v1\nkind: Pod\nThe manifest: looks: fine")
+
+
+def test_parse_args_rejects_conflicting_flags():
+    assert main.parse_args(["--batch", "p.jsonl", "--output", "r.jsonl", "--force"]).force
+    assert main.parse_args(["--serve", "--port", "9000"]).port == 9000
+    assert main.parse_args(["Deploy", "a", "--no-cache"]).prompt == ["Deploy", "a"]
+
+    for argv in (
+        ["Deploy", "a", "--batch", "p.jsonl"],
+        ["--output", "r.jsonl"],
+        ["--force"],
+        ["Deploy", "a", "--verbose"],
+        ["--port", "9000"],
+        ["--serve", "--batch", "p.jsonl"],
+        ["--serve", "Deploy", "a"],
+    ):
+        with patched(sys, "stderr", io.StringIO()):
+            try:
+                main.parse_args(argv)
+            except SystemExit as e:
+                assert e.code == 2
+            else:
+                raise AssertionError(f"{argv} should be rejected")
+
+
+def test_result_cache_round_trip_and_expiry():
+    with tempfile.TemporaryDirectory() as tmp, patched(Config, "CACHE_DIR", tmp):
+        key = main.result_cache_key("Deploy a Node.js app")
+        assert main.load_cached_result(key) is None
+
+        main.store_cached_result(key, "apiVersion: v1")
+        assert main.load_cached_result(key) == "apiVersion: v1"
+        assert os.listdir(tmp) == [f"{key}.json"]
+
+        # Expired entries are treated as misses and deleted
+        with patched(Config, "CACHE_TTL_SECONDS", -1):
+            assert main.load_cached_result(key) is None
+        assert os.listdir(tmp) == []
+
+
+def test_result_cache_discards_malformed_entries():
+    with tempfile.TemporaryDirectory() as tmp, patched(Config, "CACHE_DIR", tmp):
+        entries = {
+            "list": "[1, 2]",
+            "broken": "{not json",
+            "no-result": '{"created": 1e12}',
+        }
+        for key, content in entries.items():
+            write_lines(os.path.join(tmp, f"{key}.json"), content)
+            assert main.load_cached_result(key) is None
+        assert os.listdir(tmp) == []
+
+
+def test_concurrent_stores_of_the_same_key():
+    errors = []
+
+    def store(i):
+        try:
+            main.store_cached_result("same", f"result {i}")
+        except Exception as e:
+            errors.append(e)
+
+    with tempfile.TemporaryDirectory() as tmp, patched(Config, "CACHE_DIR", tmp):
+        threads = [threading.Thread(target=store, args=(i,)) for i in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert main.load_cached_result("same").startswith("result ")
+        assert os.listdir(tmp) == ["same.json"]
+
+
+def test_store_prunes_expired_entries():
+    with tempfile.TemporaryDirectory() as tmp, patched(Config, "CACHE_DIR", tmp):
+        stale = os.path.join(tmp, "stale.json")
+        leftover = os.path.join(tmp, "tmpabc.tmp")
+        for path in (stale, leftover):
+            write_lines(path, "{}")
+            os.utime(path, (0, 0))
+
+        main.store_cached_result("fresh", "result")
+        assert os.listdir(tmp) == ["fresh.json"]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")